@@ -1,24 +1,105 @@
-from flask import Flask, render_template, request, redirect, url_for, jsonify, flash
+from flask import Flask, render_template, request, redirect, url_for, jsonify, flash, abort
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
+from flask_sqlalchemy.pagination import SelectPagination
+from flask_migrate import Migrate, upgrade
+from sqlalchemy import create_engine, event, func, insert, select, update
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import scoped_session, sessionmaker
 from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+import asyncio
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer
+try:
+    from selectolax.parser import HTMLParser
+except ImportError: # Fall back to BeautifulSoup when selectolax is not installed
+    HTMLParser = None
+from urllib.parse import quote, urljoin, urlparse
 import feedparser
-import time
+import ahocorasick
+from collections import Counter
+from cachetools import TTLCache, cached
 import threading
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ProcessPoolExecutor
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED
 import re
 import os
+import sqlite3
+import orjson
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider encoding API responses with orjson"""
+    def _options(self, indent=False):
+        # Match the json module: stringify int keys and let default() format dates as HTTP dates
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+    
+    def dumps(self, obj, **kwargs):
+        # Callers passing options, such as the session cookie serializer, keep the default behaviour
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///content_aggregator.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 db = SQLAlchemy(app)
-migrate = Migrate(app, db)
+migrate = Migrate(app, db, directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'))
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL journaling so dashboard reads are not blocked by scraping writes"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536") # 64 MB
+    cursor.execute("PRAGMA mmap_size=268435456") # 256 MB
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+def set_sqlite_read_pragmas(dbapi_connection, connection_record):
+    """Tune read-only connections, which cannot change the journal mode"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA cache_size=-65536") # 64 MB
+    cursor.execute("PRAGMA mmap_size=268435456") # 256 MB
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+# Read-only connection to the same database for the dashboard routes, so
+# readers never contend with the scraper's writes
+with app.app_context():
+    event.listen(db.engine, "connect", set_sqlite_pragmas)
+    read_engine = create_engine(
+        URL.create(
+            'sqlite',
+            database=f'file:{quote(db.engine.url.database)}',
+            query={'mode': 'ro', 'uri': 'true'}
+        ),
+        connect_args={'check_same_thread': False}
+    )
+event.listen(read_engine, "connect", set_sqlite_read_pragmas)
+read_session = scoped_session(sessionmaker(bind=read_engine))
+
+@app.teardown_appcontext
+def remove_read_session(exception=None):
+    read_session.remove()
 
 # Database Models
 class Keyword(db.Model):
@@ -37,6 +118,9 @@ class Source(db.Model):
     source_type = db.Column(db.String(50), default='website') # website, rss
     active = db.Column(db.Boolean, default=True)
     last_scraped = db.Column(db.DateTime)
+    etag = db.Column(db.String(200)) # Validators for conditional requests
+    last_modified = db.Column(db.String(100))
+    stream_aborts = db.Column(db.Integer, default=0) # Consecutive scrapes abandoned without a keyword match
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def __repr__(self):
@@ -55,6 +139,10 @@ class Article(db.Model):
     
     source = db.relationship('Source', backref=db.backref('articles', lazy=True))
     
+    __table_args__ = (
+        db.Index('ix_article_scraped', 'scraped_date'),
+    )
+    
     def __repr__(self):
         return f'<Article {self.title[:50]}>'
 
@@ -66,37 +154,139 @@ class ArticleKeyword(db.Model):
     
     article = db.relationship('Article', backref=db.backref('keywords', lazy=True))
     keyword = db.relationship('Keyword', backref=db.backref('articles', lazy=True))
+    
+    # Indexes for the dashboard join and ordering
+    __table_args__ = (
+        db.Index('ix_ak_article_kw', 'article_id', 'keyword_id'),
+        db.Index('ix_ak_kw_article', 'keyword_id', 'article_id'),
+        db.Index('ix_ak_score', 'relevance_score'),
+    )
 
 # Content Scraper Classes
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+MAX_CONCURRENT_SOURCES = 16 # Sources scraped at the same time
+MAX_REQUESTS_PER_HOST = 2 # Polite per-host limit, replaces the fixed delay between sources
+STREAM_CHUNK_SIZE = 16384
+NO_MATCH_LIMIT = 256 * 1024 # Stop downloading pages with no candidate keyword after this many bytes
+MAX_STREAM_ABORTS = 3 # Fetch a page in full after this many early stops in a row
+
+# Common article selectors, in priority order
+ARTICLE_SELECTORS = [
+    'article', '[role="main"]', '.article-content', 
+    '.post-content', '#content', '.entry-content',
+    '.story-body', '.article-body'
+]
+
+# Only the title and content-bearing tags (with everything inside them) are
+# built by BeautifulSoup; text directly under <body> or in other top-level tags is skipped
+PAGE_STRAINER = SoupStrainer(['title', 'article', 'main', 'section', 'div', 'p', 'h1', 'h2', 'h3'])
+
 class ContentScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    def __init__(self, session, kw_pairs):
+        self.session = session
+        self.host_limits = {}
+        self.automaton = self.build_keyword_automaton(kw_pairs)
+        
+        # Raw page bytes can't be searched for non-ASCII terms, and terms with
+        # markup characters are usually entity-encoded in the page
+        self.stream_terms = all(term.isascii() and not set(term) & set('&<>') for _, term in kw_pairs)
+        self.max_term_length = max((len(term) for _, term in kw_pairs), default=1)
+    
+    def build_keyword_automaton(self, kw_pairs):
+        """Build an Aho-Corasick automaton matching all keywords in one pass"""
+        automaton = ahocorasick.Automaton()
+        for keyword, term in kw_pairs:
+            automaton.add_word(term, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def contains_keyword(self, text):
+        """Check whether any keyword occurs in already lowercased text"""
+        if not len(self.automaton):
+            return False
+        return next(self.automaton.iter(text), None) is not None
+    
+    def _host_limit(self, url):
+        """Get the semaphore limiting concurrent requests to the host of url"""
+        host = urlparse(url).netloc
+        if host not in self.host_limits:
+            self.host_limits[host] = asyncio.Semaphore(MAX_REQUESTS_PER_HOST)
+        return self.host_limits[host]
+    
+    async def _fetch(self, source, stream=False):
+        """Download a source, returning None if it is unchanged or, when streamed, cannot match any keyword"""
+        headers = {}
+        if source.etag:
+            headers['If-None-Match'] = source.etag
+        if source.last_modified:
+            headers['If-Modified-Since'] = source.last_modified
+        
+        async with self._host_limit(source.url):
+            async with self.session.get(source.url, headers=headers) as response:
+                if response.status == 304:
+                    print(f"Source unchanged: {source.name}")
+                    return None
+                response.raise_for_status()
+                # Multi-byte encodings don't keep ASCII terms as plain bytes
+                charset = (response.charset or '').lower()
+                stream = (stream and self.stream_terms
+                          and (source.stream_aborts or 0) < MAX_STREAM_ABORTS
+                          and not charset.startswith(('utf-16', 'utf-32')))
+                if stream:
+                    content = await self._read_streamed(response)
+                    if content is None:
+                        # Keep the old validators so the page is fetched again next time
+                        source.stream_aborts = (source.stream_aborts or 0) + 1
+                        return None
+                else:
+                    content = await response.read()
+        
+        source.stream_aborts = 0
+        # Stored with the scraped articles at the end of the run
+        source.etag = response.headers.get('ETag')
+        source.last_modified = response.headers.get('Last-Modified')
+        return content
     
-    def scrape_website(self, url, keywords):
+    async def _read_streamed(self, response):
+        """Read a response in chunks, giving up early if no keyword can occur in it"""
+        chunks = []
+        size = 0
+        matched = False
+        tail = b'' # Carried over so keywords split across chunks are still seen
+        
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            
+            if not matched:
+                window = tail + chunk
+                # latin-1 maps each byte to one character so ASCII terms can be found in the
+                # raw markup. Terms split by tags are missed, hence the periodic full fetch
+                matched = self.contains_keyword(window.lower().decode('latin-1'))
+                tail = window[max(len(window) - self.max_term_length + 1, 0):]
+                
+                if not matched and size >= NO_MATCH_LIMIT:
+                    response.close()
+                    return None
+        
+        return b''.join(chunks)
+    
+    async def scrape_website(self, source):
         """Scrape a website for content matching keywords"""
+        url = source.url
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            content = await self._fetch(source, stream=True)
+            if content is None:
+                return None
             
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Extract text content
-            text_content = soup.get_text()
-            title = soup.find('title').get_text() if soup.find('title') else url
+            document, title, text_content = self.parse_html(content, url)
             
             # Check if content matches keywords
-            keyword_matches = self.check_keyword_matches(text_content, keywords)
+            keyword_matches = self.check_keyword_matches(text_content)
             
             if keyword_matches:
                 # Try to extract article content more specifically
-                article_content = self.extract_article_content(soup)
+                article_content = self.extract_article_content(document)
                 
                 return {
                     'title': title.strip(),
@@ -109,25 +299,31 @@ class ContentScraper:
             print(f"Error scraping {url}: {str(e)}")
             return None
     
-    def scrape_rss(self, rss_url, keywords):
+    async def scrape_rss(self, source):
         """Scrape RSS feed for articles matching keywords"""
+        rss_url = source.url
         try:
-            feed = feedparser.parse(rss_url)
+            content = await self._fetch(source)
+            if content is None:
+                return []
+            
+            feed = feedparser.parse(content)
             articles = []
             
             for entry in feed.entries[:10]: # Limit to 10 most recent entries
                 title = entry.get('title', '')
                 content = entry.get('description', '') + ' ' + entry.get('summary', '')
                 
-                keyword_matches = self.check_keyword_matches(title + ' ' + content, keywords)
+                keyword_matches = self.check_keyword_matches(title + ' ' + content)
                 
                 if keyword_matches:
+                    published = entry.get('published_parsed')
                     articles.append({
                         'title': title,
                         'content': content[:5000],
                         'url': entry.get('link', ''),
                         'author': entry.get('author', ''),
-                        'published_date': self.parse_date(entry.get('published')),
+                        'published_date': datetime(*published[:6]) if published else None,
                         'keywords': keyword_matches
                     })
             
@@ -137,126 +333,176 @@ class ContentScraper:
             print(f"Error scraping RSS {rss_url}: {str(e)}")
             return []
     
-    def extract_article_content(self, soup):
+    def parse_html(self, content, url):
+        """Parse HTML and return the document, its title and its text content"""
+        if HTMLParser is None:
+            soup = BeautifulSoup(content, 'lxml', parse_only=PAGE_STRAINER)
+            
+            # Remove script and style elements
+            for script in soup(["script", "style"]):
+                script.decompose()
+            
+            # Extract text content
+            text_content = soup.get_text()
+            title_element = soup.find('title')
+            title = title_element.get_text() if title_element else url
+            return soup, title, text_content
+        
+        tree = HTMLParser(content)
+        
+        # Remove script and style elements
+        for node in tree.css('script, style'):
+            node.decompose()
+        
+        # Extract text content
+        text_content = tree.root.text() if tree.root else ''
+        title_node = tree.css_first('title')
+        title = title_node.text() if title_node else url
+        return tree, title, text_content
+    
+    def extract_article_content(self, document):
         """Extract main article content from HTML"""
-        # Try common article selectors
-        article_selectors = [
-            'article', '[role="main"]', '.article-content', 
-            '.post-content', '#content', '.entry-content',
-            '.story-body', '.article-body'
-        ]
+        if isinstance(document, BeautifulSoup):
+            for selector in ARTICLE_SELECTORS:
+                element = document.select_one(selector)
+                if element:
+                    return element.get_text(strip=True)
+            
+            # Fallback to all parsed content; <body> itself is not kept by PAGE_STRAINER
+            return document.get_text(strip=True)
         
-        for selector in article_selectors:
-            element = soup.select_one(selector)
-            if element:
-                return element.get_text(strip=True)
+        for selector in ARTICLE_SELECTORS:
+            node = document.css_first(selector)
+            if node:
+                return node.text(strip=True)
         
         # Fallback to body content
-        body = soup.find('body')
-        return body.get_text(strip=True) if body else soup.get_text(strip=True)
+        body = document.body
+        return body.text(strip=True) if body else document.root.text(strip=True)
     
-    def check_keyword_matches(self, content, keywords):
+    def check_keyword_matches(self, content):
         """Check which keywords match in the content"""
-        matches = []
+        if not len(self.automaton):
+            return []
+        
         content_lower = content.lower()
         
-        for keyword in keywords:
-            if keyword.term.lower() in content_lower:
-                # Calculate simple relevance score
-                count = content_lower.count(keyword.term.lower())
-                score = min(count / 10.0, 1.0) # Normalize to 0-1
-                matches.append({'keyword': keyword, 'score': score})
+        # Count every keyword occurrence in a single scan of the content
+        counts = Counter()
+        keywords = {}
+        for _, keyword in self.automaton.iter(content_lower):
+            counts[keyword.id] += 1
+            keywords[keyword.id] = keyword
         
-        return matches
-    
-    def parse_date(self, date_string):
-        """Parse date string to datetime object"""
-        if not date_string:
-            return None
+        matches = []
+        for keyword_id, count in counts.items():
+            # Calculate simple relevance score
+            score = min(count / 10.0, 1.0) # Normalize to 0-1
+            matches.append({'keyword': keywords[keyword_id], 'score': score})
         
-        try:
-            import email.utils
-            return datetime.fromtimestamp(time.mktime(email.utils.parsedate(date_string)))
-        except:
-            return None
+        return matches
 
 # Background scraping job
-def run_content_scraping():
-    """Background job to scrape content from all sources"""
+async def run_content_scraping_async():
+    """Scrape all active sources concurrently and store matching articles"""
     with app.app_context():
-        scraper = ContentScraper()
         sources = Source.query.filter_by(active=True).all()
         keywords = Keyword.query.filter_by(active=True).all()
         
-        for source in sources:
-            print(f"Scraping source: {source.name}")
+        # Lowercase each term once per scrape cycle
+        kw_pairs = [(keyword, keyword.term.lower()) for keyword in keywords]
+        
+        # Connections are pooled and kept alive for the duration of the run
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=8)
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={'User-Agent': USER_AGENT}) as session:
+            scraper = ContentScraper(session, kw_pairs)
+            source_limit = asyncio.Semaphore(MAX_CONCURRENT_SOURCES)
             
-            try:
-                if source.source_type == 'rss':
-                    articles_data = scraper.scrape_rss(source.url, keywords)
+            async def scrape_one(source):
+                async with source_limit:
+                    print(f"Scraping source: {source.name}")
+                    if source.source_type == 'rss':
+                        return await scraper.scrape_rss(source)
                     
-                    for article_data in articles_data:
-                        # Check if article already exists
-                        existing_article = Article.query.filter_by(url=article_data['url']).first()
-                        if not existing_article:
-                            article = Article(
-                                title=article_data['title'],
-                                content=article_data['content'],
-                                url=article_data['url'],
-                                author=article_data.get('author'),
-                                published_date=article_data.get('published_date'),
-                                source_id=source.id
-                            )
-                            
-                            db.session.add(article)
-                            db.session.flush() # To get article ID
-                            
-                            # Add keyword associations
-                            for keyword_match in article_data['keywords']:
-                                article_keyword = ArticleKeyword(
-                                    article_id=article.id,
-                                    keyword_id=keyword_match['keyword'].id,
-                                    relevance_score=keyword_match['score']
-                                )
-                                db.session.add(article_keyword)
-                
-                else: # website scraping
-                    article_data = scraper.scrape_website(source.url, keywords)
-                    
-                    if article_data:
-                        # Check if article already exists
-                        existing_article = Article.query.filter_by(url=article_data['url']).first()
-                        if not existing_article:
-                            article = Article(
-                                title=article_data['title'],
-                                content=article_data['content'],
-                                url=article_data['url'],
-                                source_id=source.id
-                            )
-                            
-                            db.session.add(article)
-                            db.session.flush()
-                            
-                            # Add keyword associations
-                            for keyword_match in article_data['keywords']:
-                                article_keyword = ArticleKeyword(
-                                    article_id=article.id,
-                                    keyword_id=keyword_match['keyword'].id,
-                                    relevance_score=keyword_match['score']
-                                )
-                                db.session.add(article_keyword)
+                    # website scraping
+                    article_data = await scraper.scrape_website(source)
+                    return [article_data] if article_data else []
+            
+            results = await asyncio.gather(*[scrape_one(source) for source in sources])
+        
+        # Collect new rows for every source and write them in one transaction
+        new_articles = []
+        article_matches = []
+        scraped_at = datetime.utcnow()
+        
+        # Look up which candidate articles already exist in one query
+        candidate_urls = {article_data['url'] for articles_data in results for article_data in articles_data}
+        seen_urls = set()
+        if candidate_urls:
+            seen_urls.update(db.session.scalars(select(Article.url).where(Article.url.in_(candidate_urls))))
+        
+        for source, articles_data in zip(sources, results):
+            for article_data in articles_data:
+                url = article_data['url']
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
                 
-                source.last_scraped = datetime.utcnow()
-                db.session.commit()
+                new_articles.append({
+                    'title': article_data['title'],
+                    'content': article_data['content'],
+                    'url': url,
+                    'author': article_data.get('author'),
+                    'published_date': article_data.get('published_date'),
+                    'source_id': source.id
+                })
+                article_matches.append(article_data['keywords'])
+            
+            source.last_scraped = scraped_at
+        
+        try:
+            if new_articles:
+                article_ids = db.session.execute(
+                    insert(Article).returning(Article.id, sort_by_parameter_order=True),
+                    new_articles
+                ).scalars().all()
                 
-            except Exception as e:
-                print(f"Error processing source {source.name}: {str(e)}")
-                db.session.rollback()
+                # Add keyword associations
+                article_keywords = [
+                    {
+                        'article_id': article_id,
+                        'keyword_id': keyword_match['keyword'].id,
+                        'relevance_score': keyword_match['score']
+                    }
+                    for article_id, keyword_matches in zip(article_ids, article_matches)
+                    for keyword_match in keyword_matches
+                ]
+                if article_keywords:
+                    db.session.execute(insert(ArticleKeyword), article_keywords)
+            
+            db.session.commit()
             
-            # Small delay between sources
-            time.sleep(2)
+        except Exception as e:
+            print(f"Error saving scraped articles: {str(e)}")
+            db.session.rollback()
+
+def run_content_scraping():
+    """Background job to scrape content from all sources"""
+    asyncio.run(run_content_scraping_async())
 
 # Routes
+
+# Dashboard feed query, built once; the filter value is a bound parameter
+# so SQLAlchemy reuses the compiled SQL across requests
+DASHBOARD_QUERY = (
+    select(Article)
+    .join(ArticleKeyword)
+    .join(Keyword)
+    .order_by(ArticleKeyword.relevance_score.desc(), Article.scraped_date.desc())
+)
+
 @app.route('/')
 def index():
     """Main dashboard showing personalized content feed"""
@@ -264,19 +510,18 @@ def index():
     page = request.args.get('page', 1, type=int)
     keyword_filter = request.args.get('keyword', '', type=str)
     
-    query = db.session.query(Article).join(ArticleKeyword).join(Keyword)
+    query = DASHBOARD_QUERY
     
     if keyword_filter:
-        query = query.filter(Keyword.term.ilike(f'%{keyword_filter}%'))
+        # Terms are stored lowercased, so a prefix range can use the unique index on term
+        prefix = keyword_filter.lower()
+        query = query.where(Keyword.term >= prefix, Keyword.term < prefix + '\U0010ffff')
     
-    articles = query.order_by(
-        ArticleKeyword.relevance_score.desc(),
-        Article.scraped_date.desc()
-    ).paginate(
-        page=page, per_page=20, error_out=False
+    articles = SelectPagination(
+        select=query, session=read_session(), page=page, per_page=20, error_out=False
     )
     
-    keywords = Keyword.query.filter_by(active=True).all()
+    keywords = read_session.scalars(select(Keyword).where(Keyword.active == True)).all()
     
     return render_template('index.html', articles=articles, keywords=keywords, keyword_filter=keyword_filter)
 
@@ -286,6 +531,10 @@ def manage_keywords():
     keywords = Keyword.query.all()
     return render_template('keywords.html', keywords=keywords)
 
+def reset_source_validators():
+    """Forget stored ETag/Last-Modified values so unchanged sources are rescanned for the new keyword set"""
+    db.session.execute(update(Source).values(etag=None, last_modified=None))
+
 @app.route('/keywords/add', methods=['POST'])
 def add_keyword():
     """Add a new keyword"""
@@ -296,6 +545,7 @@ def add_keyword():
         if not existing_keyword:
             keyword = Keyword(term=term.lower())
             db.session.add(keyword)
+            reset_source_validators()
             db.session.commit()
             flash(f'Keyword "{term}" added successfully!', 'success')
         else:
@@ -308,6 +558,7 @@ def toggle_keyword(keyword_id):
     """Toggle keyword active status"""
     keyword = Keyword.query.get_or_404(keyword_id)
     keyword.active = not keyword.active
+    reset_source_validators()
     db.session.commit()
     
     status = 'activated' if keyword.active else 'deactivated'
@@ -355,10 +606,14 @@ def toggle_source(source_id):
 @app.route('/scrape/manual')
 def manual_scrape():
     """Manually trigger content scraping"""
-    # Run scraping in background thread
-    thread = threading.Thread(target=run_content_scraping)
-    thread.daemon = True
-    thread.start()
+    init_scheduler()
+    
+    if 'content_scraping_job' in running_jobs:
+        flash('Scraping is already in progress. Check back in a few minutes for new content.', 'info')
+        return redirect(url_for('index'))
+    
+    # Run the scheduled job now, so it can never overlap another run
+    scheduler.modify_job('content_scraping_job', next_run_time=datetime.now())
     
     flash('Manual scraping started! Check back in a few minutes for new content.', 'info')
     return redirect(url_for('index'))
@@ -366,37 +621,73 @@ def manual_scrape():
 @app.route('/article/<int:article_id>')
 def view_article(article_id):
     """View full article details"""
-    article = Article.query.get_or_404(article_id)
+    article = read_session.get(Article, article_id)
+    if article is None:
+        abort(404)
     return render_template('article.html', article=article)
 
+@cached(cache=TTLCache(maxsize=1, ttl=60), lock=threading.Lock())
+def dashboard_stats():
+    """Count dashboard statistics, cached for a minute between polls"""
+    return {
+        'total_articles': read_session.scalar(select(func.count()).select_from(Article)),
+        'total_keywords': read_session.scalar(
+            select(func.count()).select_from(Keyword).where(Keyword.active == True)
+        ),
+        'total_sources': read_session.scalar(
+            select(func.count()).select_from(Source).where(Source.active == True)
+        ),
+        'recent_articles': read_session.scalar(
+            select(func.count()).select_from(Article).where(
+                Article.scraped_date >= datetime.utcnow().replace(hour=0, minute=0, second=0)
+            )
+        )
+    }
+
 @app.route('/api/stats')
 def api_stats():
     """API endpoint for dashboard statistics"""
-    stats = {
-        'total_articles': Article.query.count(),
-        'total_keywords': Keyword.query.filter_by(active=True).count(),
-        'total_sources': Source.query.filter_by(active=True).count(),
-        'recent_articles': Article.query.filter(
-            Article.scraped_date >= datetime.utcnow().replace(hour=0, minute=0, second=0)
-        ).count()
-    }
-    return jsonify(stats)
+    return jsonify(dashboard_stats())
+
+# Scraping runs in a single worker process, one run at a time
+scheduler = BackgroundScheduler(
+    executors={'default': ProcessPoolExecutor(1)},
+    # Starting the worker process can take longer than the default 1 second grace time
+    job_defaults={'coalesce': True, 'max_instances': 1, 'misfire_grace_time': None}
+)
+scheduler_lock = threading.Lock()
+running_jobs = set() # Ids of jobs currently running in the worker process
+
+def track_running_jobs(event):
+    if event.code == EVENT_JOB_SUBMITTED:
+        running_jobs.add(event.job_id)
+    else:
+        running_jobs.discard(event.job_id)
+
+scheduler.add_listener(
+    track_running_jobs,
+    EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED
+)
 
 # Initialize scheduler for background scraping
 def init_scheduler():
-    scheduler = BackgroundScheduler()
-    # Schedule scraping every 4 hours
-    scheduler.add_job(
-        func=run_content_scraping,
-        trigger="interval",
-        hours=4,
-        id='content_scraping_job'
-    )
-    scheduler.start()
+    with scheduler_lock:
+        if scheduler.running:
+            return
+        
+        # Schedule scraping every 4 hours
+        scheduler.add_job(
+            func=run_content_scraping,
+            trigger="interval",
+            hours=4,
+            id='content_scraping_job'
+        )
+        scheduler.start()
 
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+        upgrade() # Bring databases created by older versions up to date
         
         # Add some default data if tables are empty
         if not Keyword.query.first():
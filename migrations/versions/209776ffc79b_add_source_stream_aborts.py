@@ -0,0 +1,33 @@
+"""add source stream aborts
+
+Revision ID: 209776ffc79b
+Revises: e1be36b52945
+Create Date: 2026-10-14 17:32:18.604127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '209776ffc79b'
+down_revision = 'e1be36b52945'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by db.create_all() may already have this column
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('source'):
+        return
+    columns = {column['name'] for column in inspector.get_columns('source')}
+
+    if 'stream_aborts' not in columns:
+        with op.batch_alter_table('source', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('stream_aborts', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('source', schema=None) as batch_op:
+        batch_op.drop_column('stream_aborts')
@@ -0,0 +1,36 @@
+"""add source validators
+
+Revision ID: 8a83301897e3
+Revises: 
+Create Date: 2026-10-14 17:05:09.897630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a83301897e3'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by db.create_all() may already have these columns
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('source'):
+        return
+    columns = {column['name'] for column in inspector.get_columns('source')}
+
+    with op.batch_alter_table('source', schema=None) as batch_op:
+        if 'etag' not in columns:
+            batch_op.add_column(sa.Column('etag', sa.String(length=200), nullable=True))
+        if 'last_modified' not in columns:
+            batch_op.add_column(sa.Column('last_modified', sa.String(length=100), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('source', schema=None) as batch_op:
+        batch_op.drop_column('last_modified')
+        batch_op.drop_column('etag')
@@ -0,0 +1,48 @@
+"""add dashboard indexes
+
+Revision ID: e1be36b52945
+Revises: 8a83301897e3
+Create Date: 2026-10-14 17:20:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1be36b52945'
+down_revision = '8a83301897e3'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'article': [
+        ('ix_article_scraped', ['scraped_date']),
+    ],
+    'article_keyword': [
+        ('ix_ak_article_kw', ['article_id', 'keyword_id']),
+        ('ix_ak_kw_article', ['keyword_id', 'article_id']),
+        ('ix_ak_score', ['relevance_score']),
+    ],
+}
+
+
+def upgrade():
+    # Databases created by db.create_all() may already have these indexes
+    inspector = sa.inspect(op.get_bind())
+    for table, indexes in INDEXES.items():
+        if not inspector.has_table(table):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table)}
+
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for name, columns in indexes:
+                if name not in existing:
+                    batch_op.create_index(name, columns, unique=False)
+
+
+def downgrade():
+    for table, indexes in INDEXES.items():
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for name, _ in reversed(indexes):
+                batch_op.drop_index(name)